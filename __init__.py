@@ -1,21 +1,49 @@
 from .runpod_client_helper import (
+    RunpodClient,
+    Mp3Result,
+    NoOutputFromRunpodException,
+    NoWorkersAvailableException,
+    RunpodRequestException,
+    check_health,
+    cancel_job,
+    close_session,
+    clear_status_cache,
     send_async_transcription_request,
+    send_async_batch_transcription_request,
     get_transcription_status,
     wait_for_transcription_completion,
     transcribe_audio,
+    transcribe_audio_via_webhook,
+    transcribe_batch,
+    convert_to_mp3,
     convert_to_mp3_and_base64,
     decode_base64_to_mp3,
     checkFileSize,
+    get_audio_duration,
     trim_audio_to_size
 )
 
 __all__ = [
+    "RunpodClient",
+    "Mp3Result",
+    "NoOutputFromRunpodException",
+    "NoWorkersAvailableException",
+    "RunpodRequestException",
+    "check_health",
+    "cancel_job",
+    "close_session",
+    "clear_status_cache",
     "send_async_transcription_request",
+    "send_async_batch_transcription_request",
     "get_transcription_status",
     "wait_for_transcription_completion",
     "transcribe_audio",
+    "transcribe_audio_via_webhook",
+    "transcribe_batch",
+    "convert_to_mp3",
     "convert_to_mp3_and_base64",
     "decode_base64_to_mp3",
-    "checkFileSize"
+    "checkFileSize",
+    "get_audio_duration",
     "trim_audio_to_size"
 ]
@@ -1,16 +1,457 @@
 import time
+import random
 import requests
-import json
 import ffmpeg
 import os
 import base64
+import gzip
+import functools
 import tempfile
+import shutil
+import subprocess
+from collections import OrderedDict
+from typing import NamedTuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
 
 
 class NoOutputFromRunpodException(Exception):
     """Exception raised when there is no output from Runpod."""
 
 
+class NoWorkersAvailableException(Exception):
+    """Exception raised when an endpoint has no workers to pick up a job."""
+
+
+class RunpodRequestException(Exception):
+    """
+    Exception raised when a request to the Runpod API fails, whichever HTTP
+    backend sent it. status_code is set for HTTP error responses and the
+    original requests/httpx exception is chained as __cause__.
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class Mp3Result(NamedTuple):
+    """Base64-encoded MP3 data and its encoded size in MB."""
+
+    data: str
+    size_mb: float
+
+
+# Seconds to wait for a connection or response before giving up (and retrying)
+_REQUEST_TIMEOUT = 30
+_MAX_RETRIES = 5
+_RETRY_BACKOFF_FACTOR = 0.5
+_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+# A POST to /run is not idempotent: after a read error or a 5xx Runpod may
+# already have queued the job, so re-sending it could start a duplicate. Only
+# rate limiting and overload responses, which are rejected up front, are safe.
+_POST_RETRY_STATUSES = frozenset({429, 503})
+
+# Shared session so polling and repeated jobs reuse the same keep-alive
+# connection to api.runpod.ai instead of doing a TLS handshake per call.
+# GETs are retried on transient errors; POSTs only on connection failures
+# here (before anything is sent) and on _POST_RETRY_STATUSES in RunpodClient.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=_MAX_RETRIES,
+            connect=3,
+            read=3,
+            backoff_factor=_RETRY_BACKOFF_FACTOR,
+            status_forcelist=sorted(_RETRY_STATUSES),
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+        ),
+    ),
+)
+_SESSION.headers.update({"Content-Type": "application/json"})
+
+
+def close_session():
+    """
+    Closes the shared HTTP session and releases its pooled connections.
+    """
+    _SESSION.close()
+
+
+# Health responses change on a seconds scale, so they are reused briefly.
+_HEALTH_CACHE_TTL = 5
+_health_cache = {}
+
+# Terminal job statuses never change, so they are cached until evicted.
+_TERMINAL_STATUSES = {"COMPLETED", "FAILED", "CANCELLED", "TIMED_OUT"}
+_STATUS_CACHE_MAXSIZE = 10000
+_status_cache = OrderedDict()
+
+
+def _parse_response(response):
+    """
+    Raises for HTTP errors and returns the decoded JSON body.
+    """
+    response.raise_for_status()
+    return _loads(response.content)
+
+
+def _job_id(data):
+    """
+    Returns the job ID from a /run response, raising if Runpod did not return one.
+    """
+    if "id" not in data:
+        raise NoOutputFromRunpodException(data)
+    return data["id"]
+
+
+def clear_status_cache():
+    """
+    Clears the cached job status and health responses.
+    """
+    _status_cache.clear()
+    _health_cache.clear()
+
+
+def _to_audio_input(audio):
+    """
+    Builds the job input for a URL, Base64 string, raw bytes or file path.
+
+    Bytes and paths are Base64-encoded here, right before sending, so the
+    inflated representation only lives for the duration of the request.
+    """
+    if isinstance(audio, str):
+        if audio.startswith("http"):
+            return {"audio_url": audio}
+        return {"audio_base_64": audio}
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        return {"audio_base_64": _encode_bytes_to_base64(audio).decode("ascii")}
+    if isinstance(audio, os.PathLike):
+        return {"audio_base_64": _encode_file_to_base64(audio).decode("ascii")}
+    raise TypeError(f"Unsupported audio input type: {type(audio).__name__}")
+
+
+class RunpodClient:
+    """
+    Runpod API client bound to one API key and endpoint.
+
+    URLs and headers are built once at construction, so repeated calls such
+    as status polling don't rebuild them on every request.
+
+    With http2=True requests go through an httpx client (requires the
+    optional httpx[http2] dependency), which multiplexes concurrent polls
+    over a single connection. It keeps the same retry behaviour as the
+    requests session: connection failures, transient statuses on GETs, and
+    429/503 on POSTs are retried. Call close() when done with such a client.
+
+    Failed requests raise RunpodRequestException on either backend.
+    """
+
+    def __init__(self, api_key, server_endpoint, session=None, http2=False):
+        self.api_key = api_key
+        self.server_endpoint = server_endpoint
+        self._owns_session = False
+        # requests takes the raw body as data=, httpx as content=
+        self._body_kwarg = "data"
+        # The requests session retries GETs in its adapter already
+        self._get_retry_statuses = frozenset()
+        # requests has no session-wide timeout, so it is passed per request
+        self._request_kwargs = {"timeout": _REQUEST_TIMEOUT}
+        self._transport_errors = (requests.RequestException,)
+
+        if http2 and session is None:
+            import httpx
+
+            # httpx ignores the client's http2/limits arguments when a
+            # transport is given, so they are set on the transport itself.
+            # Its retries only cover connection failures.
+            session = httpx.Client(
+                timeout=_REQUEST_TIMEOUT,
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=8, max_keepalive_connections=8
+                    ),
+                    retries=3,
+                ),
+            )
+            self._owns_session = True
+            self._body_kwarg = "content"
+            self._get_retry_statuses = _RETRY_STATUSES
+            self._request_kwargs = {}
+            self._transport_errors = (httpx.HTTPError,)
+        self._session = session if session is not None else _SESSION
+
+        base_url = f"https://api.runpod.ai/v2/{server_endpoint}"
+        self._run_url = f"{base_url}/run"
+        self._status_url_tmpl = f"{base_url}/status/%s"
+        self._cancel_url_tmpl = f"{base_url}/cancel/%s"
+        self._health_url = f"{base_url}/health"
+
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        self._gzip_headers = {**self._headers, "Content-Encoding": "gzip"}
+        self._health_cache_key = (server_endpoint, api_key)
+
+    def _retry_delay(self, response, attempt):
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(float(retry_after), 0)
+            except ValueError:
+                pass
+        return _RETRY_BACKOFF_FACTOR * (2**attempt)
+
+    def _request(self, method, url, retry_statuses=frozenset(), **kwargs):
+        """
+        Sends a request, re-sending it on retry_statuses with backoff and
+        Retry-After support, and returns the decoded JSON body.
+        """
+        send = getattr(self._session, method)
+        kwargs = {**self._request_kwargs, **kwargs}
+        try:
+            for attempt in range(_MAX_RETRIES + 1):
+                response = send(url, **kwargs)
+                if (
+                    response.status_code not in retry_statuses
+                    or attempt == _MAX_RETRIES
+                ):
+                    break
+                time.sleep(self._retry_delay(response, attempt))
+            return _parse_response(response)
+        except self._transport_errors as e:
+            error_response = getattr(e, "response", None)
+            status_code = getattr(error_response, "status_code", None)
+            raise RunpodRequestException(
+                f"Runpod request to {url} failed: {e}", status_code
+            ) from e
+
+    def _post_job(self, payload, gzip_payload=False):
+        body = _dumps(payload)
+        if gzip_payload:
+            body = gzip.compress(body, compresslevel=1)
+            headers = self._gzip_headers
+        else:
+            headers = self._headers
+        response = self._request(
+            "post",
+            self._run_url,
+            _POST_RETRY_STATUSES,
+            headers=headers,
+            **{self._body_kwarg: body},
+        )
+        return _job_id(response)
+
+    def close(self):
+        """
+        Closes the underlying HTTP client if this RunpodClient created it.
+        """
+        if self._owns_session:
+            self._session.close()
+
+    def check_health(self):
+        """
+        Checks health and worker statistics of the endpoint.
+
+        Returns:
+            dict: Health statistics response from Runpod.
+        """
+        cached = _health_cache.get(self._health_cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _HEALTH_CACHE_TTL:
+            return cached[1]
+
+        response = self._request(
+            "get", self._health_url, self._get_retry_statuses, headers=self._headers
+        )
+        _health_cache[self._health_cache_key] = (time.monotonic(), response)
+        return response
+
+    def cancel_job(self, job_id):
+        """
+        Cancels a transcription job given its job ID.
+
+        Args:
+            job_id (str): Job ID of the transcription request to cancel.
+
+        Returns:
+            dict: Cancellation response from Runpod.
+        """
+        return self._request(
+            "post",
+            self._cancel_url_tmpl % job_id,
+            _POST_RETRY_STATUSES,
+            headers=self._headers,
+        )
+
+    def send_async_transcription_request(
+        self,
+        base64_string_or_url,
+        execution_timeout=600000,
+        webhook_url=None,
+        gzip_payload=False,
+    ):
+        """
+        Sends an asynchronous transcription request to Runpod.
+
+        See the module-level send_async_transcription_request for arguments.
+
+        Returns:
+            str: Job ID of the transcription request.
+        """
+        payload = {
+            "input": _to_audio_input(base64_string_or_url),
+            "policy": {"executionTimeout": execution_timeout},
+        }
+        if webhook_url:
+            payload["webhook"] = webhook_url
+        return self._post_job(payload, gzip_payload)
+
+    def send_async_batch_transcription_request(
+        self,
+        list_of_base64_or_urls,
+        batch_size=16,
+        execution_timeout=600000,
+        gzip_payload=False,
+    ):
+        """
+        Sends several audio inputs to Runpod as a single transcription job.
+
+        See the module-level send_async_batch_transcription_request for arguments.
+
+        Returns:
+            str: Job ID of the transcription request.
+        """
+        audio_inputs = [_to_audio_input(x) for x in list_of_base64_or_urls]
+        payload = {
+            "input": {"audio_inputs": audio_inputs, "batch_size": batch_size},
+            "policy": {"executionTimeout": execution_timeout},
+        }
+        return self._post_job(payload, gzip_payload)
+
+    def get_transcription_status(self, job_id):
+        """
+        Gets the status of a transcription job from Runpod.
+
+        Args:
+            job_id (str): Job ID of the transcription request.
+
+        Returns:
+            dict: Status response from Runpod.
+        """
+        cache_key = (self.server_endpoint, job_id)
+        if cache_key in _status_cache:
+            _status_cache.move_to_end(cache_key)
+            return _status_cache[cache_key]
+
+        response = self._request(
+            "get",
+            self._status_url_tmpl % job_id,
+            self._get_retry_statuses,
+            headers=self._headers,
+        )
+
+        if response.get("status") in _TERMINAL_STATUSES:
+            _status_cache[cache_key] = response
+            if len(_status_cache) > _STATUS_CACHE_MAXSIZE:
+                _status_cache.popitem(last=False)
+        return response
+
+    def wait_for_transcription_completion(
+        self, job_id, polling_interval=20, initial_interval=1.0, max_interval=None
+    ):
+        """
+        Waits for the transcription job to complete and returns the output.
+
+        See the module-level wait_for_transcription_completion for arguments.
+
+        Returns:
+            dict: Transcription output or status.
+        """
+        if max_interval is None:
+            max_interval = polling_interval
+        delay = min(initial_interval, max_interval)
+
+        while True:
+            status_response = self.get_transcription_status(job_id)
+            status = status_response["status"]
+
+            if status in ["IN_PROGRESS", "IN_QUEUE"]:
+                time.sleep(delay + random.uniform(0, delay * 0.1))
+                delay = min(delay * 1.8, max_interval)
+            else:
+                if status == "COMPLETED":
+                    return {
+                        "status": "COMPLETED",
+                        "output": status_response.get("output"),
+                    }
+                else:
+                    raise NoOutputFromRunpodException(
+                        f"Transcription job failed with status: {status}"
+                    )
+
+    def ensure_workers_available(self):
+        """
+        Raises NoWorkersAvailableException if no worker is ready, idle,
+        running or initializing on the endpoint.
+
+        Uses the briefly cached health response, so calling this before every
+        job in a batch costs at most one health request every few seconds.
+        """
+        workers = self.check_health().get("workers", {})
+        available = sum(
+            workers.get(state, 0)
+            for state in ("ready", "idle", "running", "initializing")
+        )
+        if available == 0:
+            raise NoWorkersAvailableException(
+                f"No workers available on endpoint {self.server_endpoint}: {workers}"
+            )
+
+    def transcribe_audio(
+        self, base64_string_or_url, polling_interval=20, require_healthy=False
+    ):
+        """
+        Transcribes audio using Runpod's API.
+
+        See the module-level transcribe_audio for arguments.
+
+        Returns:
+            dict: Transcription output or status.
+        """
+        if require_healthy:
+            self.ensure_workers_available()
+        job_id = self.send_async_transcription_request(base64_string_or_url)
+        return self.wait_for_transcription_completion(job_id, polling_interval)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_client(api_key, server_endpoint):
+    """
+    Returns a shared RunpodClient for an API key and endpoint pair.
+    """
+    return RunpodClient(api_key, server_endpoint)
+
+
 def check_health(api_key, server_endpoint):
     """
     Checks health and worker statistics of a particular endpoint.
@@ -22,13 +463,7 @@ def check_health(api_key, server_endpoint):
     Returns:
         dict: Health statistics response from Runpod.
     """
-    url = f"https://api.runpod.ai/v2/{server_endpoint}/health"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}",
-    }
-    response = requests.get(url, headers=headers).json()
-    return response
+    return _get_client(api_key, server_endpoint).check_health()
 
 
 def cancel_job(job_id, api_key, server_endpoint):
@@ -43,48 +478,71 @@ def cancel_job(job_id, api_key, server_endpoint):
     Returns:
         dict: Cancellation response from Runpod.
     """
-    url = f"https://api.runpod.ai/v2/{server_endpoint}/cancel/{job_id}"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}",
-    }
-    response = requests.post(url, headers=headers).json()
-    return response
+    return _get_client(api_key, server_endpoint).cancel_job(job_id)
 
 
 def send_async_transcription_request(
-    base64_string_or_url, api_key, server_endpoint, execution_timeout=600000
+    base64_string_or_url,
+    api_key,
+    server_endpoint,
+    execution_timeout=600000,
+    webhook_url=None,
+    gzip_payload=False,
 ):
     """
     Sends an asynchronous transcription request to Runpod.
 
     Args:
-        base64_string_or_url (str): Base64-encoded audio data or a URL that starts with "http".
+        base64_string_or_url (str | bytes | os.PathLike): Base64-encoded audio data, a URL that
+            starts with "http", raw audio bytes, or a path to an audio file.
         api_key (str): Runpod API key.
         server_endpoint (str): Server endpoint.
         execution_timeout (int): Execution timeout in milliseconds, default is 600,000 (10 minutes).
+        webhook_url (str, optional): URL Runpod will POST the finished job to.
+        gzip_payload (bool, optional): Gzip the request body. Worthwhile for large Base64 inputs;
+            passing a URL instead avoids uploading the audio at all.
 
     Returns:
         str: Job ID of the transcription request.
     """
-    url = f"https://api.runpod.ai/v2/{server_endpoint}/run"
+    return _get_client(api_key, server_endpoint).send_async_transcription_request(
+        base64_string_or_url, execution_timeout, webhook_url, gzip_payload
+    )
 
-    payload_base64 = {"audio_base_64": base64_string_or_url}
-    payload_url = {"audio_url": base64_string_or_url}
 
-    policy = {"executionTimeout": execution_timeout}
+def send_async_batch_transcription_request(
+    list_of_base64_or_urls,
+    api_key,
+    server_endpoint,
+    batch_size=16,
+    execution_timeout=600000,
+    gzip_payload=False,
+):
+    """
+    Sends several audio inputs to Runpod as a single transcription job.
+
+    The worker loads the model once and transcribes every entry of
+    "audio_inputs", so the handler must iterate that list (e.g. calling
+    model.transcribe(..., batch_size=batch_size) per entry) and return a list
+    of outputs in the same order.
 
-    if base64_string_or_url.startswith("http"):
-        payload = json.dumps({"input": payload_url, "policy": policy})
-    else:
-        payload = json.dumps({"input": payload_base64, "policy": policy})
+    Args:
+        list_of_base64_or_urls (list[str | bytes | os.PathLike]): Base64-encoded audio data, URLs
+            that start with "http", raw audio bytes, or paths to audio files.
+        api_key (str): Runpod API key.
+        server_endpoint (str): Server endpoint.
+        batch_size (int): Batch size the worker should use for inference. Default is 16.
+        execution_timeout (int): Execution timeout in milliseconds, default is 600,000 (10 minutes).
+        gzip_payload (bool, optional): Gzip the request body.
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}",
-    }
-    response = requests.post(url, headers=headers, data=payload).json()
-    return response["id"]
+    Returns:
+        str: Job ID of the transcription request.
+    """
+    return _get_client(
+        api_key, server_endpoint
+    ).send_async_batch_transcription_request(
+        list_of_base64_or_urls, batch_size, execution_timeout, gzip_payload
+    )
 
 
 def get_transcription_status(job_id, api_key, server_endpoint):
@@ -99,70 +557,276 @@ def get_transcription_status(job_id, api_key, server_endpoint):
     Returns:
         dict: Status response from Runpod.
     """
-    url = f"https://api.runpod.ai/v2/{server_endpoint}/status/{job_id}"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}",
-    }
-    response = requests.get(url, headers=headers).json()
-    return response
+    return _get_client(api_key, server_endpoint).get_transcription_status(job_id)
 
 
 def wait_for_transcription_completion(
-    job_id, api_key, server_endpoint, polling_interval=20
+    job_id,
+    api_key,
+    server_endpoint,
+    polling_interval=20,
+    initial_interval=1.0,
+    max_interval=None,
 ):
     """
     Waits for the transcription job to complete and returns the output.
 
+    Status checks start at initial_interval and back off exponentially,
+    with a little jitter, up to max_interval.
+
     Args:
         job_id (str): Job ID of the transcription request.
         api_key (str): Runpod API key.
         server_endpoint (str): Server endpoint.
-        sleep_interval (int, optional): Time in seconds to sleep between status checks. Default is 20 seconds.
+        polling_interval (int, optional): Maximum time in seconds between status checks. Default is 20 seconds.
+        initial_interval (float, optional): Time in seconds before the second status check. Default is 1 second.
+        max_interval (float, optional): Overrides polling_interval as the backoff cap.
 
     Returns:
         dict: Transcription output or status.
     """
-    while True:
-        status_response = get_transcription_status(job_id, api_key, server_endpoint)
-        status = status_response["status"]
-
-        if status in ["IN_PROGRESS", "IN_QUEUE"]:
-            time.sleep(polling_interval)
-        else:
-            if status == "COMPLETED":
-                return {
-                    "status": "COMPLETED",
-                    "output": status_response.get("output"),
-                }
-            else:
-                raise NoOutputFromRunpodException(
-                    f"Transcription job failed with status: {status}"
-                )
+    return _get_client(api_key, server_endpoint).wait_for_transcription_completion(
+        job_id, polling_interval, initial_interval, max_interval
+    )
 
 
 def transcribe_audio(
-    base64_string_or_url, runpod_api_key, server_endpoint, polling_interval=20
+    base64_string_or_url,
+    runpod_api_key,
+    server_endpoint,
+    polling_interval=20,
+    require_healthy=False,
 ):
     """
     Transcribes audio using Runpod's API.
 
     Args:
-        base64_string_or_url (str): Base64-encoded audio data or a URL that starts with "http".
+        base64_string_or_url (str | bytes | os.PathLike): Base64-encoded audio data, a URL that
+            starts with "http", raw audio bytes, or a path to an audio file.
         api_key (str): Runpod API key.
         server_endpoint (str): Server endpoint.
+        polling_interval (int, optional): Maximum time in seconds between status checks. Default is 20 seconds.
+        require_healthy (bool, optional): Check endpoint health first and raise
+            NoWorkersAvailableException instead of submitting when no workers are available.
+            Leave off for endpoints that scale to zero, which report no workers until a job arrives.
 
     Returns:
         dict: Transcription output or status.
     """
-    job_id = send_async_transcription_request(
-        base64_string_or_url, runpod_api_key, server_endpoint
+    return _get_client(runpod_api_key, server_endpoint).transcribe_audio(
+        base64_string_or_url, polling_interval, require_healthy
     )
-    return wait_for_transcription_completion(
-        job_id, runpod_api_key, server_endpoint, polling_interval
+
+
+def transcribe_audio_via_webhook(
+    base64_string_or_url, runpod_api_key, server_endpoint, webhook_url
+):
+    """
+    Submits audio for transcription and has Runpod deliver the result to a webhook.
+
+    Unlike transcribe_audio this does not poll; it returns as soon as the job
+    is queued. See runpod_webhook_receiver.WebhookReceiver for a server that
+    can await the delivered result.
+
+    Args:
+        base64_string_or_url (str | bytes | os.PathLike): Base64-encoded audio data, a URL that
+            starts with "http", raw audio bytes, or a path to an audio file.
+        runpod_api_key (str): Runpod API key.
+        server_endpoint (str): Server endpoint.
+        webhook_url (str): URL Runpod will POST the finished job to.
+
+    Returns:
+        str: Job ID of the transcription request.
+    """
+    return send_async_transcription_request(
+        base64_string_or_url, runpod_api_key, server_endpoint, webhook_url=webhook_url
     )
 
 
+def transcribe_batch(
+    list_of_base64_or_urls,
+    runpod_api_key,
+    server_endpoint,
+    batch_size=16,
+    max_per_job=None,
+    polling_interval=20,
+):
+    """
+    Transcribes several audio inputs using batched Runpod jobs.
+
+    Inputs are grouped into jobs of at most max_per_job entries. All jobs are
+    submitted before any is waited on, so they run in parallel on the endpoint.
+
+    Args:
+        list_of_base64_or_urls (list[str | bytes | os.PathLike]): Base64-encoded audio data, URLs
+            that start with "http", raw audio bytes, or paths to audio files.
+        runpod_api_key (str): Runpod API key.
+        server_endpoint (str): Server endpoint.
+        batch_size (int): Batch size the worker should use for inference. Default is 16.
+        max_per_job (int, optional): Maximum inputs per job. Default is all inputs in one job.
+        polling_interval (int, optional): Maximum time in seconds between status checks. Default is 20 seconds.
+
+    Returns:
+        list: Transcription outputs in the same order as the inputs.
+    """
+    if max_per_job is not None and max_per_job < 1:
+        raise ValueError(f"max_per_job must be at least 1, got {max_per_job}")
+    if not list_of_base64_or_urls:
+        return []
+
+    chunk_size = max_per_job or len(list_of_base64_or_urls)
+    chunks = [
+        list_of_base64_or_urls[i : i + chunk_size]
+        for i in range(0, len(list_of_base64_or_urls), chunk_size)
+    ]
+
+    pending_job_ids = []
+    try:
+        for chunk in chunks:
+            pending_job_ids.append(
+                send_async_batch_transcription_request(
+                    chunk, runpod_api_key, server_endpoint, batch_size
+                )
+            )
+
+        outputs = []
+        for chunk, job_id in zip(chunks, list(pending_job_ids)):
+            result = wait_for_transcription_completion(
+                job_id, runpod_api_key, server_endpoint, polling_interval
+            )
+            pending_job_ids.remove(job_id)
+            outputs.extend(_batch_outputs(result, job_id, len(chunk)))
+        return outputs
+    except BaseException:
+        # Nobody will collect the other jobs' results, so stop them using GPU time
+        for job_id in pending_job_ids:
+            try:
+                cancel_job(job_id, runpod_api_key, server_endpoint)
+            except Exception as e:
+                print(f"Failed to cancel job {job_id}: {e}")
+        raise
+
+
+def _batch_outputs(result, job_id, expected_count):
+    """
+    Returns the per-input outputs of a batch job, raising if the handler did
+    not return a list with one entry per input.
+    """
+    output = result.get("output")
+    if not isinstance(output, list) or len(output) != expected_count:
+        raise NoOutputFromRunpodException(
+            f"Batch job {job_id} returned {type(output).__name__} output, "
+            f"expected a list of {expected_count} results"
+        )
+    return output
+
+
+# Read size for streaming Base64 encoding; a multiple of 3 so no chunk
+# except the last produces padding.
+_BASE64_CHUNK_SIZE = 57 * 1024
+
+
+def _encode_bytes_to_base64(data):
+    """
+    Base64-encodes bytes in fixed-size chunks to keep allocations small.
+
+    The ASCII result is returned as bytes; callers decode it only where a str
+    is actually required.
+    """
+    view = memoryview(data)
+    parts = [
+        base64.b64encode(view[i : i + _BASE64_CHUNK_SIZE])
+        for i in range(0, len(view), _BASE64_CHUNK_SIZE)
+    ]
+    return b"".join(parts)
+
+
+def _encode_file_to_base64(path):
+    """
+    Base64-encodes a file in fixed-size chunks to keep peak memory flat.
+    """
+    parts = []
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_BASE64_CHUNK_SIZE), b""):
+            parts.append(base64.b64encode(block))
+    return b"".join(parts)
+
+
+@functools.lru_cache(maxsize=None)
+def _mp3_output_kwargs():
+    """
+    Returns ffmpeg output options for a fast mono 32k speech MP3 encode.
+
+    libshine is used when a short test encode with it succeeds, since it is
+    much faster than libmp3lame at low bitrates. It only supports 32, 44.1 and
+    48 kHz, so it encodes at 32 kHz. Otherwise libmp3lame runs at 22.05 kHz
+    with its fastest algorithm setting. Quality is irrelevant here as Whisper
+    resamples to 16 kHz mono anyway.
+    """
+    kwargs = {"ac": 1, "ab": "32k", "format": "mp3", "threads": "0"}
+
+    shine_kwargs = {**kwargs, "ar": "32000", "acodec": "libshine"}
+    try:
+        result = subprocess.run(
+            [
+                "ffmpeg",
+                "-v",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                "anullsrc=r=32000:cl=mono",
+                "-t",
+                "0.1",
+                "-ac",
+                "1",
+                "-ar",
+                shine_kwargs["ar"],
+                "-b:a",
+                shine_kwargs["ab"],
+                "-c:a",
+                "libshine",
+                "-f",
+                "mp3",
+                "-",
+            ],
+            capture_output=True,
+        )
+        if result.returncode == 0:
+            return shine_kwargs
+    except OSError:
+        pass
+
+    return {**kwargs, "ar": "22050", "acodec": "libmp3lame", "compression_level": "9"}
+
+
+def convert_to_mp3(input_path):
+    """
+    Converts an audio or video file to mono 32k MP3 and returns the MP3 bytes.
+
+    The result can be passed straight to transcribe_audio, which Base64-encodes
+    it at send time.
+
+    Args:
+    input_path (str): The file path of the input audio or video file.
+
+    Returns:
+    bytes: The converted MP3 data.
+
+    Raises:
+    ffmpeg.Error: If an error occurs during the conversion process.
+    """
+    process = (
+        ffmpeg.input(input_path)
+        .output("pipe:", **_mp3_output_kwargs())
+        .run_async(pipe_stdout=True, pipe_stderr=True)
+    )
+    mp3_bytes, stderr = process.communicate()
+    if process.returncode != 0:
+        raise ffmpeg.Error("ffmpeg", mp3_bytes, stderr)
+    return mp3_bytes
+
+
 def convert_to_mp3_and_base64(input_path):
     """
     Converts an audio or video file to MP3 format with specified settings,
@@ -170,46 +834,33 @@ def convert_to_mp3_and_base64(input_path):
 
     This function takes an input file path, converts the file to a mono MP3
     file with a bitrate of 32k, and encodes this MP3 file to a Base64 string.
-    It handles the creation and deletion of temporary files used during the conversion process.
+    The MP3 is read straight from ffmpeg's stdout, so no temporary file is written.
 
     Args:
     input_path (str): The file path of the input audio or video file.
 
     Returns:
-    str: A Base64 encoded string of the converted MP3 file.
+    Mp3Result: The Base64 encoded string of the converted MP3 file (data)
+    and its size in MB (size_mb), or None if the conversion failed.
 
     Raises:
     ffmpeg.Error: If an error occurs during the conversion process.
     """
     try:
-        # Create a temporary file for the MP3
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as temp_mp3_file:
-            output_mp3_path = temp_mp3_file.name
-
-            # Convert the file to MP3
-            (
-                ffmpeg.input(input_path)
-                .output(output_mp3_path, ac=1, ar="22050", ab="32k", format="mp3")
-                .run(overwrite_output=True)
-            )
-            print(
-                f"Conversion to MP3 successful. Temp file created at {output_mp3_path}"
-            )
+        # Convert the file to MP3 and capture it from stdout
+        mp3_bytes = convert_to_mp3(input_path)
+        print("Conversion to MP3 successful.")
 
-            # Encode the MP3 file directly in Base64
-            with open(output_mp3_path, "rb") as mp3_file:
-                base64_encoded_data = base64.b64encode(mp3_file.read()).decode("utf-8")
+        # Encode the MP3 data in Base64 chunk by chunk
+        base64_bytes = _encode_bytes_to_base64(mp3_bytes)
+        del mp3_bytes
 
-        # Get the size of the Base64 string
-        base64_size = len(base64_encoded_data.encode("utf-8")) / (
-            1024 * 1024
-        )  # size in MB
+        # Get the size of the Base64 data without re-encoding it
+        base64_size = len(base64_bytes) / (1024 * 1024)  # size in MB
         print(f"Base64 Encoded Size: {base64_size:.2f} MB")
 
-        # Clean up the temporary MP3 file
-        os.remove(output_mp3_path)
-
-        return [base64_encoded_data, base64_size]
+        # Base64 is pure ASCII, so this is a plain copy rather than a UTF-8 round trip
+        return Mp3Result(base64_bytes.decode("ascii"), base64_size)
 
     except ffmpeg.Error as e:
         print(f"An error occurred: {e}")
@@ -237,7 +888,7 @@ def convert_to_mono_mp3(input_path, output_path):
         # Convert the file to MP3
         (
             ffmpeg.input(input_path)
-            .output(output_path, ac=1, ar="22050", ab="32k", format="mp3")
+            .output(output_path, **_mp3_output_kwargs())
             .run(overwrite_output=True)
         )
         print(f"Conversion to MP3 successful. MP3 file created at {output_path}")
@@ -294,9 +945,53 @@ def checkFileSize(input_path):
         print(f"An error occurred: {e}")
         return None
 
+def get_audio_duration(input_file):
+    """
+    Returns the duration of an audio or video file in seconds.
+
+    Only the container's format duration is requested from ffprobe, which is
+    much cheaper than a full ffmpeg.probe when nothing else is needed.
+
+    Args:
+        input_file (str): The path to the input file.
+
+    Returns:
+        float: Duration in seconds, or None if the container does not record one
+        (ffprobe reports "N/A" for some streamed or raw inputs).
+
+    Raises:
+        subprocess.CalledProcessError: If ffprobe cannot read the file.
+    """
+    out = subprocess.check_output(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=nw=1:nk=1",
+            input_file,
+        ]
+    )
+    try:
+        return float(out.strip())
+    except ValueError:
+        return None
+
+
+# Headroom below the target for ffmpeg's -fs overshoot (up to a few packets)
+_TRIM_SAFETY_MARGIN_BYTES = 64 * 1024
+
+
 def trim_audio_to_size(input_file: str, target_size_mb: float) -> str:
     """
-    Trim the audio file to ensure it's below the specified size in MB.
+    Trim the audio file so it ends up at roughly the specified size in MB.
+
+    ffmpeg's -fs limit can overshoot slightly, so a small margin is kept
+    below the target. That margin keeps MP3 files under it, but containers
+    that write their index after the cut (e.g. mp4/m4a) can still end up
+    over the target.
 
     Args:
         input_file (str): The path to the input audio file.
@@ -313,21 +1008,33 @@ def trim_audio_to_size(input_file: str, target_size_mb: float) -> str:
         print(f"File size is already within the limit. No trimming needed.")
         return input_file
 
-    # Calculate duration of the audio file
-    probe = ffmpeg.probe(input_file)
-    duration_seconds = float(probe['streams'][0]['duration'])
-
-    # Calculate target duration based on target size
-    target_duration_seconds = (target_size_mb / current_size_mb) * duration_seconds
-
-    # Trim the audio file to the target duration
-    output_file = input_file
-    (
-        ffmpeg
-        .input(input_file)
-        .output(output_file, t=target_duration_seconds)
-        .run(overwrite_output=True)
+    # Write to a sibling temp file; ffmpeg cannot safely read and write the same path
+    suffix = os.path.splitext(input_file)[1]
+    fd, output_file = tempfile.mkstemp(
+        suffix=suffix, dir=os.path.dirname(os.path.abspath(input_file))
     )
+    os.close(fd)
 
-    print(f"Trimmed audio saved as {output_file}")
-    return output_file
+    # Let ffmpeg stop just under the target size; MP3 input is stream-copied, not re-encoded
+    target_bytes = int(target_size_mb * 1024 * 1024)
+    output_kwargs = {"fs": max(target_bytes - _TRIM_SAFETY_MARGIN_BYTES, 1)}
+    if suffix.lower() == ".mp3":
+        output_kwargs["c"] = "copy"
+
+    try:
+        (
+            ffmpeg
+            .input(input_file)
+            .output(output_file, **output_kwargs)
+            .run(overwrite_output=True)
+        )
+        # mkstemp creates the file as 0600; keep the input's permissions
+        shutil.copymode(input_file, output_file)
+        os.replace(output_file, input_file)
+    except Exception:
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        raise
+
+    print(f"Trimmed audio saved as {input_file}")
+    return input_file
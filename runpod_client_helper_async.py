@@ -0,0 +1,336 @@
+import asyncio
+import random
+import aiohttp
+
+from .runpod_client_helper import (
+    NoOutputFromRunpodException,
+    _batch_outputs,
+    _job_id,
+    _to_audio_input,
+)
+
+
+def create_session(api_key):
+    """
+    Creates an aiohttp session configured for the Runpod API.
+
+    The session carries the authorization header and a pooled keep-alive
+    connector, so it can be shared by many concurrent transcription jobs.
+
+    Args:
+        api_key (str): Runpod API key.
+
+    Returns:
+        aiohttp.ClientSession: Session to pass to the other helpers.
+    """
+    return aiohttp.ClientSession(
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+        },
+        connector=aiohttp.TCPConnector(limit=64, keepalive_timeout=75),
+    )
+
+
+async def send_async_transcription_request(
+    base64_string_or_url,
+    session,
+    server_endpoint,
+    execution_timeout=600000,
+    webhook_url=None,
+):
+    """
+    Sends an asynchronous transcription request to Runpod.
+
+    Args:
+        base64_string_or_url (str | bytes | os.PathLike): Base64-encoded audio data, a URL that
+            starts with "http", raw audio bytes, or a path to an audio file.
+        session (aiohttp.ClientSession): Session created with create_session.
+        server_endpoint (str): Server endpoint.
+        execution_timeout (int): Execution timeout in milliseconds, default is 600,000 (10 minutes).
+        webhook_url (str, optional): URL Runpod will POST the finished job to.
+
+    Returns:
+        str: Job ID of the transcription request.
+    """
+    url = f"https://api.runpod.ai/v2/{server_endpoint}/run"
+
+    policy = {"executionTimeout": execution_timeout}
+    payload = {"input": _to_audio_input(base64_string_or_url), "policy": policy}
+
+    if webhook_url:
+        payload["webhook"] = webhook_url
+
+    async with session.post(url, json=payload) as response:
+        response.raise_for_status()
+        return _job_id(await response.json())
+
+
+async def send_async_batch_transcription_request(
+    list_of_base64_or_urls,
+    session,
+    server_endpoint,
+    batch_size=16,
+    execution_timeout=600000,
+):
+    """
+    Sends several audio inputs to Runpod as a single transcription job.
+
+    See runpod_client_helper.send_async_batch_transcription_request for the
+    handler contract.
+
+    Args:
+        list_of_base64_or_urls (list[str | bytes | os.PathLike]): Base64-encoded audio data, URLs
+            that start with "http", raw audio bytes, or paths to audio files.
+        session (aiohttp.ClientSession): Session created with create_session.
+        server_endpoint (str): Server endpoint.
+        batch_size (int): Batch size the worker should use for inference. Default is 16.
+        execution_timeout (int): Execution timeout in milliseconds, default is 600,000 (10 minutes).
+
+    Returns:
+        str: Job ID of the transcription request.
+    """
+    url = f"https://api.runpod.ai/v2/{server_endpoint}/run"
+
+    audio_inputs = [_to_audio_input(x) for x in list_of_base64_or_urls]
+    payload = {
+        "input": {"audio_inputs": audio_inputs, "batch_size": batch_size},
+        "policy": {"executionTimeout": execution_timeout},
+    }
+
+    async with session.post(url, json=payload) as response:
+        response.raise_for_status()
+        return _job_id(await response.json())
+
+
+async def get_transcription_status(job_id, session, server_endpoint):
+    """
+    Gets the status of a transcription job from Runpod.
+
+    Args:
+        job_id (str): Job ID of the transcription request.
+        session (aiohttp.ClientSession): Session created with create_session.
+        server_endpoint (str): Server endpoint.
+
+    Returns:
+        dict: Status response from Runpod.
+    """
+    url = f"https://api.runpod.ai/v2/{server_endpoint}/status/{job_id}"
+    async with session.get(url) as response:
+        response.raise_for_status()
+        return await response.json()
+
+
+async def cancel_job(job_id, session, server_endpoint):
+    """
+    Cancels a transcription job given its job ID.
+
+    Args:
+        job_id (str): Job ID of the transcription request to cancel.
+        session (aiohttp.ClientSession): Session created with create_session.
+        server_endpoint (str): Server endpoint.
+
+    Returns:
+        dict: Cancellation response from Runpod.
+    """
+    url = f"https://api.runpod.ai/v2/{server_endpoint}/cancel/{job_id}"
+    async with session.post(url) as response:
+        response.raise_for_status()
+        return await response.json()
+
+
+async def wait_for_transcription_completion(
+    job_id,
+    session,
+    server_endpoint,
+    polling_interval=20,
+    initial_interval=1.0,
+    max_interval=None,
+):
+    """
+    Waits for the transcription job to complete and returns the output.
+
+    Status checks start at initial_interval and back off exponentially,
+    with a little jitter, up to max_interval.
+
+    Args:
+        job_id (str): Job ID of the transcription request.
+        session (aiohttp.ClientSession): Session created with create_session.
+        server_endpoint (str): Server endpoint.
+        polling_interval (int, optional): Maximum time in seconds between status checks. Default is 20 seconds.
+        initial_interval (float, optional): Time in seconds before the second status check. Default is 1 second.
+        max_interval (float, optional): Overrides polling_interval as the backoff cap.
+
+    Returns:
+        dict: Transcription output or status.
+    """
+    if max_interval is None:
+        max_interval = polling_interval
+    delay = min(initial_interval, max_interval)
+
+    while True:
+        status_response = await get_transcription_status(
+            job_id, session, server_endpoint
+        )
+        status = status_response["status"]
+
+        if status in ["IN_PROGRESS", "IN_QUEUE"]:
+            await asyncio.sleep(delay + random.uniform(0, delay * 0.1))
+            delay = min(delay * 1.8, max_interval)
+        else:
+            if status == "COMPLETED":
+                return {
+                    "status": "COMPLETED",
+                    "output": status_response.get("output"),
+                }
+            else:
+                raise NoOutputFromRunpodException(
+                    f"Transcription job failed with status: {status}"
+                )
+
+
+async def transcribe_audio(
+    base64_string_or_url,
+    runpod_api_key,
+    server_endpoint,
+    polling_interval=20,
+    session=None,
+):
+    """
+    Transcribes audio using Runpod's API.
+
+    Args:
+        base64_string_or_url (str | bytes | os.PathLike): Base64-encoded audio data, a URL that
+            starts with "http", raw audio bytes, or a path to an audio file.
+        runpod_api_key (str): Runpod API key.
+        server_endpoint (str): Server endpoint.
+        polling_interval (int, optional): Maximum time in seconds between status checks. Default is 20 seconds.
+        session (aiohttp.ClientSession, optional): Shared session. A temporary one is created if omitted.
+
+    Returns:
+        dict: Transcription output or status.
+    """
+    if session is None:
+        async with create_session(runpod_api_key) as session:
+            return await transcribe_audio(
+                base64_string_or_url,
+                runpod_api_key,
+                server_endpoint,
+                polling_interval,
+                session,
+            )
+
+    job_id = await send_async_transcription_request(
+        base64_string_or_url, session, server_endpoint
+    )
+    return await wait_for_transcription_completion(
+        job_id, session, server_endpoint, polling_interval
+    )
+
+
+async def transcribe_many(
+    list_of_inputs, runpod_api_key, server_endpoint, polling_interval=20
+):
+    """
+    Transcribes many audio inputs concurrently over a single shared session.
+
+    Args:
+        list_of_inputs (list[str | bytes | os.PathLike]): Base64-encoded audio data, URLs,
+            raw audio bytes, or paths to audio files.
+        runpod_api_key (str): Runpod API key.
+        server_endpoint (str): Server endpoint.
+        polling_interval (int, optional): Maximum time in seconds between status checks. Default is 20 seconds.
+
+    Returns:
+        list[dict]: Transcription outputs in the same order as the inputs.
+    """
+    async with create_session(runpod_api_key) as session:
+        return await asyncio.gather(
+            *[
+                transcribe_audio(
+                    x, runpod_api_key, server_endpoint, polling_interval, session
+                )
+                for x in list_of_inputs
+            ]
+        )
+
+
+async def transcribe_batch(
+    list_of_base64_or_urls,
+    runpod_api_key,
+    server_endpoint,
+    batch_size=16,
+    max_per_job=None,
+    polling_interval=20,
+):
+    """
+    Transcribes several audio inputs using batched Runpod jobs.
+
+    Inputs are grouped into jobs of at most max_per_job entries, which are
+    submitted and polled concurrently over a single shared session.
+
+    Args:
+        list_of_base64_or_urls (list[str | bytes | os.PathLike]): Base64-encoded audio data, URLs
+            that start with "http", raw audio bytes, or paths to audio files.
+        runpod_api_key (str): Runpod API key.
+        server_endpoint (str): Server endpoint.
+        batch_size (int): Batch size the worker should use for inference. Default is 16.
+        max_per_job (int, optional): Maximum inputs per job. Default is all inputs in one job.
+        polling_interval (int, optional): Maximum time in seconds between status checks. Default is 20 seconds.
+
+    Returns:
+        list: Transcription outputs in the same order as the inputs.
+    """
+    if max_per_job is not None and max_per_job < 1:
+        raise ValueError(f"max_per_job must be at least 1, got {max_per_job}")
+    if not list_of_base64_or_urls:
+        return []
+
+    chunk_size = max_per_job or len(list_of_base64_or_urls)
+    chunks = [
+        list_of_base64_or_urls[i : i + chunk_size]
+        for i in range(0, len(list_of_base64_or_urls), chunk_size)
+    ]
+    pending_job_ids = set()
+
+    async def run_chunk(chunk):
+        job_id = await send_async_batch_transcription_request(
+            chunk, session, server_endpoint, batch_size
+        )
+        pending_job_ids.add(job_id)
+        result = await wait_for_transcription_completion(
+            job_id, session, server_endpoint, polling_interval
+        )
+        pending_job_ids.discard(job_id)
+        return _batch_outputs(result, job_id, len(chunk))
+
+    async with create_session(runpod_api_key) as session:
+        tasks = [asyncio.ensure_future(run_chunk(chunk)) for chunk in chunks]
+        try:
+            chunk_outputs = await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop waiting on the other chunks and cancel their jobs so they
+            # don't keep using GPU time with nobody collecting the results
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for job_id in pending_job_ids:
+                try:
+                    await cancel_job(job_id, session, server_endpoint)
+                except Exception as e:
+                    print(f"Failed to cancel job {job_id}: {e}")
+            raise
+    return [output for outputs in chunk_outputs for output in outputs]
+
+
+def transcribe_many_sync(
+    list_of_inputs, runpod_api_key, server_endpoint, polling_interval=20
+):
+    """
+    Synchronous wrapper around transcribe_many for callers without an event loop.
+    """
+    return asyncio.run(
+        transcribe_many(
+            list_of_inputs, runpod_api_key, server_endpoint, polling_interval
+        )
+    )
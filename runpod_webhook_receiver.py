@@ -0,0 +1,149 @@
+import asyncio
+import hmac
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+from aiohttp import web
+
+from .runpod_client_helper import NoOutputFromRunpodException
+
+
+class WebhookReceiver:
+    """
+    Minimal aiohttp server that receives Runpod job webhooks.
+
+    Submit jobs with webhook_url set to webhook_url_for(public_base_url), then
+    await wait_for_job(job_id) to get the result without polling /status.
+
+    Every webhook must carry the receiver's secret as a "secret" query
+    parameter; requests without it are rejected. Results that arrive before
+    anyone waits on them are kept in a bounded store for early_result_ttl
+    seconds.
+    """
+
+    def __init__(
+        self,
+        secret,
+        host="0.0.0.0",
+        port=8080,
+        path="/webhook",
+        max_early_results=1000,
+        early_result_ttl=300,
+    ):
+        if not secret:
+            raise ValueError("A webhook secret is required")
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_early_results = max_early_results
+        self.early_result_ttl = early_result_ttl
+        self._futures = {}
+        self._early_results = OrderedDict()
+        self._runner = None
+
+    def webhook_url_for(self, public_base_url):
+        """
+        Returns the webhook URL, including the secret, to pass to Runpod.
+
+        Args:
+            public_base_url (str): Base URL Runpod can reach this server on, e.g. "https://host:8080".
+
+        Returns:
+            str: URL for the webhook_url argument of the submit helpers.
+        """
+        url = f"{public_base_url.rstrip('/')}{self.path}"
+        separator = "&" if "?" in url else "?"
+        return f"{url}{separator}{urlencode({'secret': self.secret})}"
+
+    def _prune_early_results(self):
+        cutoff = time.monotonic() - self.early_result_ttl
+        while self._early_results:
+            job_id, (received_at, _) = next(iter(self._early_results.items()))
+            if received_at >= cutoff:
+                break
+            del self._early_results[job_id]
+
+    async def _handle(self, request):
+        secret = request.query.get("secret", "")
+        if not hmac.compare_digest(secret.encode(), self.secret.encode()):
+            return web.Response(status=403, text="Forbidden")
+
+        try:
+            data = await request.json()
+        except ValueError:
+            return web.Response(status=400, text="Invalid JSON")
+        job_id = data.get("id") if isinstance(data, dict) else None
+        if job_id is None:
+            return web.Response(status=400, text="Missing job id")
+
+        if job_id in self._futures:
+            future = self._futures[job_id][0]
+            if not future.done():
+                future.set_result(data)
+        else:
+            # The webhook may arrive before wait_for_job is called
+            self._prune_early_results()
+            self._early_results[job_id] = (time.monotonic(), data)
+            self._early_results.move_to_end(job_id)
+            while len(self._early_results) > self.max_early_results:
+                self._early_results.popitem(last=False)
+        return web.Response(text="OK")
+
+    async def start(self):
+        """Starts serving webhooks on host:port/path."""
+        app = web.Application()
+        app.router.add_post(self.path, self._handle)
+        # The access log records the request line, which includes the secret
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        """Stops the server and cancels any pending waits."""
+        for future, _ in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._early_results.clear()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def wait_for_job(self, job_id, timeout=None):
+        """
+        Waits for the webhook for job_id and returns the output.
+
+        Args:
+            job_id (str): Job ID returned when the job was submitted.
+            timeout (float, optional): Seconds to wait before raising asyncio.TimeoutError.
+
+        Returns:
+            dict: Transcription output or status.
+        """
+        self._prune_early_results()
+        early = self._early_results.pop(job_id, None)
+        if early is not None:
+            data = early[1]
+        else:
+            # All waiters on a job share one future; shield it so one waiter
+            # timing out or being cancelled doesn't cancel it for the others
+            if job_id in self._futures:
+                future, waiters = self._futures[job_id]
+            else:
+                future, waiters = asyncio.get_running_loop().create_future(), 0
+            self._futures[job_id] = (future, waiters + 1)
+            try:
+                data = await asyncio.wait_for(asyncio.shield(future), timeout)
+            finally:
+                future, waiters = self._futures[job_id]
+                if waiters > 1:
+                    self._futures[job_id] = (future, waiters - 1)
+                else:
+                    del self._futures[job_id]
+
+        status = data.get("status")
+        if status == "COMPLETED":
+            return {"status": "COMPLETED", "output": data.get("output")}
+        raise NoOutputFromRunpodException(
+            f"Transcription job failed with status: {status}"
+        )